@@ -10,7 +10,6 @@ import os
 import sys
 import matplotlib.pyplot as plt
 from mpl_toolkits import mplot3d
-from scipy.interpolate import griddata
 import matplotlib.gridspec as gridspec
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 
@@ -24,7 +23,11 @@ appDataPath = os.path.join(repoPath, "appendix", "Data")
 sys.path.append("utils")
 from plotting import newfig, savefig, saveResultDir
 
-def prep_data(path, N_u=None, N_f=None, N_n=None, q=None, ub=None, lb=None, noise=0.0, idx_t_0=None, idx_t_1=None, N_0=None, N_1=None):
+# Sampling the training points with the faster Generator interface,
+# seeded once here so that successive prep_data calls still draw different points
+rng = np.random.default_rng(1234)
+
+def prep_data(path, N_u=None, N_f=None, N_n=None, q=None, ub=None, lb=None, noise=0.0, idx_t_0=None, idx_t_1=None, N_0=None, N_1=None, dtype=None):
     # Reading external data [t is 100x1, usol is 256x100 (solution), x is 256x1]
     data = scipy.io.loadmat(path)
 
@@ -35,13 +38,20 @@ def prep_data(path, N_u=None, N_f=None, N_n=None, q=None, ub=None, lb=None, nois
     # Keeping the 2D data for the solution data (real() is maybe to make it float by default, in case of zeroes)
     Exact_u = np.real(data['usol']).T # T x N
 
+    # Matching the precision of the model right away, which covers every array of the N_u-only path
+    # (the collocation points and IRK weights of the other paths keep their own precision)
+    if dtype != None:
+      t = t.astype(dtype)
+      x = x.astype(dtype)
+      Exact_u = Exact_u.astype(dtype)
+
     # x = np.load("1d-burgers/data/burgers_x.npy")[:, None]
     # t = np.load("1d-burgers/data/burgers_t.npy")[:, None]
     # Exact_u = np.load("1d-burgers/data/burgers_u.npy").T
 
     if N_n != None and q != None and ub != None and lb != None and idx_t_0 != None and idx_t_1 != None:
       dt = t[idx_t_1] - t[idx_t_0]
-      idx_x = np.random.choice(Exact_u.shape[1], N_n, replace=False) 
+      idx_x = rng.choice(Exact_u.shape[1], N_n, replace=False, shuffle=False) 
       x_0 = x[idx_x,:]
       u_0 = Exact_u[idx_t_0:idx_t_0+1,idx_x].T
       u_0 = u_0 + noise*np.std(u_0)*np.random.randn(u_0.shape[0], u_0.shape[1])
@@ -70,18 +80,18 @@ def prep_data(path, N_u=None, N_f=None, N_n=None, q=None, ub=None, lb=None, nois
     u_star = Exact_u.flatten()[:,None]
                 
     # Noiseless data TODO: add support for noisy data    
-    idx = np.random.choice(X_star.shape[0], N_u, replace=False)
+    idx = rng.choice(X_star.shape[0], N_u, replace=False, shuffle=False)
     X_u_train = X_star[idx,:]
     u_train = u_star[idx,:]
 
     if N_0 != None and N_1 != None:
       Exact_u = Exact_u.T
-      idx_x = np.random.choice(Exact_u.shape[0], N_0, replace=False)
+      idx_x = rng.choice(Exact_u.shape[0], N_0, replace=False, shuffle=False)
       x_0 = x[idx_x,:]
       u_0 = Exact_u[idx_x,idx_t_0][:,None]
       u_0 = u_0 + noise*np.std(u_0)*np.random.randn(u_0.shape[0], u_0.shape[1])
           
-      idx_x = np.random.choice(Exact_u.shape[0], N_1, replace=False)
+      idx_x = rng.choice(Exact_u.shape[0], N_1, replace=False, shuffle=False)
       x_1 = x[idx_x,:]
       u_1 = Exact_u[idx_x,idx_t_1][:,None]
       u_1 = u_1 + noise*np.std(u_1)*np.random.randn(u_1.shape[0], u_1.shape[1])
@@ -122,7 +132,7 @@ def prep_data(path, N_u=None, N_f=None, N_n=None, q=None, ub=None, lb=None, nois
     X_f_train = lb + (ub-lb)*lhs(2, N_f)
 
     # Generating a uniform random sample from ints between 0, and the size of x_u_train, of size N_u (initial data size) and without replacement (unique)
-    idx = np.random.choice(X_u_train.shape[0], N_u, replace=False)
+    idx = rng.choice(X_u_train.shape[0], N_u, replace=False, shuffle=False)
     # Getting the corresponding X_u_train (which is now scarce boundary/initial coordinates)
     X_u_train = X_u_train[idx,:]
     # Getting the corresponding u_train
@@ -132,9 +142,9 @@ def prep_data(path, N_u=None, N_f=None, N_n=None, q=None, ub=None, lb=None, nois
 
 def plot_inf_cont_results(X_star, u_pred, X_u_train, u_train, Exact_u, X, T, x, t, save_path=None, save_hp=None):
 
-  # Interpolating the results on the whole (x,t) domain.
-  # griddata(points, values, points at which to interpolate, method)
-  U_pred = griddata(X_star, u_pred, (X, T), method='cubic')
+  # Laying the results back on the whole (x,t) domain.
+  # X_star is the row-major flattening of the (X, T) mesh, so no interpolation is needed
+  U_pred = u_pred.reshape(T.shape)
 
   # Creating the figures
   fig, ax = newfig(1.0, 1.1)
@@ -329,7 +339,7 @@ def plot_ide_cont_results(X_star, u_pred, X_u_train, u_train,
     fig, ax = newfig(1.0, 1.4)
     ax.axis('off')
 
-    U_pred = griddata(X_star, u_pred.flatten(), (X, T), method='cubic')
+    U_pred = u_pred.reshape(T.shape)
     
     ####### Row 0: u(t,x) ##################    
     gs0 = gridspec.GridSpec(1, 2)
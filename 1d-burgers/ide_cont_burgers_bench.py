@@ -12,7 +12,6 @@ tf.random.set_seed(1234)
 
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
-from scipy.interpolate import griddata
 
 sys.path.append("1d-burgers")
 from custom_lbfgs import lbfgs, Struct
@@ -61,19 +60,19 @@ print("Error NN: ", np.linalg.norm(u_star - u_pred_nn, 2) / np.linalg.norm(u_sta
 
 #%% PLOTTING u(x,t) (PINN, NN, STAR)
 ax = plt.subplot()
-U_pred = griddata(X_star, u_pred.flatten(), (X, T), method='cubic')
+U_pred = u_pred.reshape(T.shape)
 h = ax.imshow(U_pred.T, interpolation='nearest', cmap='rainbow', 
                   extent=[t.min(), t.max(), x.min(), x.max()], 
                   origin='lower', aspect='auto')
 plt.show()
 ax = plt.subplot()
-U_pred_nn = griddata(X_star, u_pred_nn.flatten(), (X, T), method='cubic')
+U_pred_nn = u_pred_nn.reshape(T.shape)
 h = ax.imshow(U_pred_nn.T, interpolation='nearest', cmap='rainbow', 
                   extent=[t.min(), t.max(), x.min(), x.max()], 
                   origin='lower', aspect='auto')
 plt.show()
 ax = plt.subplot()
-U_star = griddata(X_star, u_star.flatten(), (X, T), method='cubic')
+U_star = u_star.reshape(T.shape)
 h = ax.imshow(U_star.T, interpolation='nearest', cmap='rainbow', 
                   extent=[t.min(), t.max(), x.min(), x.max()], 
                   origin='lower', aspect='auto')
@@ -105,7 +104,7 @@ def hessian(x):
             hessian[k, l, :, :] = grad_kl
     return hessian
 
-U = griddata(X_star, u_pred_nn.flatten(), (X, T), method='cubic').T
+U = u_pred_nn.reshape(T.shape).T
 dx = x[1, 0] - x[0, 0]
 dt = t[1, 0] - t[0, 0]
 grads = np.gradient(U)
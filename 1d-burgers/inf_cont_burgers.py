@@ -51,9 +51,9 @@ class BurgersInformedNN(NeuralNetwork):
 
         self.nu = nu
 
-        # Separating the collocation coordinates
-        self.x_f = self.tensor(X_f[:, 0:1])
-        self.t_f = self.tensor(X_f[:, 1:2])
+        # Keeping the collocation coordinates packed together, since each
+        # row of u only depends on its own (x, t) row
+        self.X_f = self.tensor(X_f)
 
     # Defining custom loss
     def loss(self, u, u_pred):
@@ -64,25 +64,25 @@ class BurgersInformedNN(NeuralNetwork):
     # The actual PINN
     def f_model(self):
         # Using the new GradientTape paradigm of TF2.0,
-        # which keeps track of operations to get the gradient at runtime
-        with tf.GradientTape(persistent=True) as tape:
-            # Watching the two inputs we’ll need later, x and t
-            tape.watch(self.x_f)
-            tape.watch(self.t_f)
-            # Packing together the inputs
-            X_f = tf.stack([self.x_f[:, 0], self.t_f[:, 0]], axis=1)
-
-            # Getting the prediction
-            u = self.model(X_f)
-            # Deriving INSIDE the tape (since we’ll need the x derivative of this later, u_xx)
-            u_x = tape.gradient(u, self.x_f)
-
-        # Getting the other derivatives
-        u_xx = tape.gradient(u_x, self.x_f)
-        u_t = tape.gradient(u, self.t_f)
-
-        # Letting the tape go
-        del tape
+        # which keeps track of operations to get the gradient at runtime.
+        # The outer tape only records the first derivative for u_xx, so
+        # neither of them needs to be persistent
+        with tf.GradientTape() as tape_xx:
+            tape_xx.watch(self.X_f)
+            with tf.GradientTape() as tape:
+                # Watching the inputs we’ll need later, x and t
+                tape.watch(self.X_f)
+
+                # Getting the prediction
+                u = self.model(self.X_f)
+
+            # Deriving INSIDE the outer tape (since we’ll need the x derivative of this later, u_xx)
+            u_X = tape.gradient(u, self.X_f)
+            u_x = u_X[:, 0:1]
+
+        # Getting the other derivatives, as columns of the input gradients
+        u_t = u_X[:, 1:2]
+        u_xx = tape_xx.gradient(u_x, self.X_f)[:, 0:1]
 
         nu = self.get_params(numpy=True)
 
@@ -92,11 +92,6 @@ class BurgersInformedNN(NeuralNetwork):
     def get_params(self, numpy=False):
         return self.nu
 
-    def predict(self, X_star):
-        u_star = self.model(X_star)
-        f_star = self.f_model()
-        return u_star.numpy(), f_star.numpy()
-
 # %% TRAINING THE MODEL
 
 
@@ -112,7 +107,7 @@ pinn = BurgersInformedNN(hp, logger, X_f, ub, lb, nu=0.01/np.pi)
 
 # Defining the error function for the logger and training
 def error():
-    u_pred, _ = pinn.predict(X_star)
+    u_pred = pinn.predict(X_star)
     return np.linalg.norm(u_star - u_pred, 2) / np.linalg.norm(u_star, 2)
 
 
@@ -120,7 +115,7 @@ logger.set_error_fn(error)
 pinn.fit(X_u_train, u_train)
 
 # Getting the model predictions
-u_pred, _ = pinn.predict(X_star)
+u_pred = pinn.predict(X_star)
 
 # %% PLOTTING
 plot_inf_cont_results(X_star, u_pred.flatten(), X_u_train, u_train,
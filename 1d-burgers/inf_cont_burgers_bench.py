@@ -13,7 +13,6 @@ tf.random.set_seed(1234)
 
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
-from scipy.interpolate import griddata
 
 sys.path.append("1d-burgers")
 from custom_lbfgs import lbfgs, Struct
@@ -125,11 +125,10 @@ class SchrodingerInformedNN(NeuralNetwork):
         mse_f = tf.reduce_mean(tf.square(f_u_pred)) + \
             tf.reduce_mean(tf.square(f_v_pred))
 
-        tf.print(f"mse_0 {mse_0}    mse_b {mse_b}    mse_f    {mse_f}")
         return mse_0 + mse_b + mse_f
 
     def predict(self, X_star):
-        h_pred = self.model(X_star)
+        h_pred = self.predict_model(self.tensor(X_star))
         u_pred = h_pred[:, 0:1]
         v_pred = h_pred[:, 1:2]
         return u_pred.numpy(), v_pred.numpy()
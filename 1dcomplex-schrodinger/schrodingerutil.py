@@ -11,7 +11,6 @@ import json
 import sys
 import matplotlib.pyplot as plt
 from mpl_toolkits import mplot3d
-from scipy.interpolate import griddata
 import matplotlib.gridspec as gridspec
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 
@@ -63,14 +62,11 @@ def prep_data(path, N_0, N_b, N_f, noise):
 
 def plot_inf_cont_results(X_star, u_pred, v_pred, h_pred, Exact_h, X, T, x, t, ub, lb, x0, tb, save_path=None, save_hp=None):
 
-    # Interpolating the results on the whole (x,t) domain.
-    # griddata(points, values, points at which to interpolate, method)
-    U_pred = griddata(X_star, u_pred.flatten(), (X, T), method='cubic')
-    V_pred = griddata(X_star, v_pred.flatten(), (X, T), method='cubic')
-    H_pred = griddata(X_star, h_pred.flatten(), (X, T), method='cubic')
-
-    # FU_pred = griddata(X_star, f_u_pred.flatten(), (X, T), method='cubic')
-    # FV_pred = griddata(X_star, f_v_pred.flatten(), (X, T), method='cubic')     
+    # Laying the results back on the whole (x,t) domain.
+    # X_star is the row-major flattening of the (X, T) mesh, so no interpolation is needed
+    U_pred = u_pred.reshape(T.shape)
+    V_pred = v_pred.reshape(T.shape)
+    H_pred = h_pred.reshape(T.shape)
 
     X0 = np.concatenate((x0, 0*x0), 1) # (x0, 0)
     X_lb = np.concatenate((0*tb + lb[0], tb), 1) # (lb[0], tb)
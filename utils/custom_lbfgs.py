@@ -64,7 +64,11 @@ def lbfgs(opfunc, x, config, state, do_verbose, log_fn):
     # evaluate initial f(x) and df/dx
   f, g = opfunc(x)
 
-  f_hist = [f]
+  # keep the loss history on the host, preallocated for one entry per iteration
+  # (rather than a list holding a live tensor for each of them)
+  f_hist = np.empty(maxIter + 1)
+  f_hist[0] = f
+  nHist = 1
   currentFuncEval = 1
   state.funcEval = state.funcEval + 1
   p = g.shape[0]
@@ -73,7 +77,7 @@ def lbfgs(opfunc, x, config, state, do_verbose, log_fn):
   tmp1 = tf.abs(g)
   if tf.reduce_sum(tmp1) <= tolFun:
     verbose("optimality condition below tolFun")
-    return x, f_hist
+    return x, f_hist[:nHist]
 
   # optimize for a max of maxIter iterations
   nIter = 0
@@ -168,7 +172,8 @@ def lbfgs(opfunc, x, config, state, do_verbose, log_fn):
     if lineSearch and isinstance(lineSearch) == types.FunctionType:
       # perform line search, using user function
       f,g,x,t,lsFuncEval = lineSearch(opfunc,x,t,d,f,g,gtd,lineSearchOpts)
-      f_hist.append(f)
+      f_hist[nHist] = f
+      nHist = nHist + 1
     else:
       # no line search, simply move with fixed-step
       x += t*d
@@ -179,7 +184,8 @@ def lbfgs(opfunc, x, config, state, do_verbose, log_fn):
         # no use to re-evaluate that function here
         f, g = opfunc(x)
         lsFuncEval = 1
-        f_hist.append(f)
+        f_hist[nHist] = f
+        nHist = nHist + 1
 
 
     # update func eval
@@ -233,7 +239,7 @@ def lbfgs(opfunc, x, config, state, do_verbose, log_fn):
   state.t = t
   state.d = d
 
-  return x, f_hist, currentFuncEval
+  return x, f_hist[:nHist], currentFuncEval
 
 # dummy/Struct gives Lua-like struct object with 0 defaults
 class dummy(object):
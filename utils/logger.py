@@ -12,7 +12,8 @@ class Logger(object):
 
         print("TensorFlow version: {}".format(tf.__version__))
         print("Eager execution: {}".format(tf.executing_eagerly()))
-        print("GPU-accerelated: {}".format(tf.test.is_gpu_available()))
+        print("GPU-accerelated: {}".format(
+            bool(tf.config.list_physical_devices("GPU"))))
 
         self.start_time = time.time()
         self.prev_time = self.start_time
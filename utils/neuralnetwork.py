@@ -4,6 +4,11 @@ import numpy as np
 from custom_lbfgs import lbfgs, Struct
 
 
+# Precision the model runs in, which its data should be loaded in too
+def get_dtype(hp):
+    return "float32" if hp.get("mixed_precision") else "float64"
+
+
 class NeuralNetwork(object):
     def __init__(self, hp, logger, ub, lb):
 
@@ -16,25 +21,47 @@ class NeuralNetwork(object):
         self.nt_config.nCorrection = hp["nt_ncorr"]
         self.nt_config.tolFun = 1.0 * np.finfo(float).eps
         self.tf_epochs = hp["tf_epochs"]
+        self.tf_batch_size = hp.get("tf_batch_size")
+        # Owning the mini-batch generator, since stateful random ops ignore
+        # the global TF seed once compiled by XLA. Seeding it directly keeps
+        # the global stream, and thus the initial weights, untouched
+        self.tf_rng = tf.random.Generator.from_seed(
+            hp.get("tf_batch_seed", 1234))
         self.tf_optimizer = tf.keras.optimizers.Adam(
             learning_rate=hp["tf_lr"],
             beta_1=hp["tf_b1"],
             epsilon=hp["tf_eps"])
 
-        self.dtype = "float64"
-        # Descriptive Keras model
+        # Optionally running the hidden layers in half precision
+        # ("mixed_bfloat16"), with variables, inputs normalization, outputs
+        # and thus the residuals kept in float32. float16 would need loss
+        # scaling in grad, which isn't implemented, so it is rejected
+        policy = hp.get("mixed_precision")
+        if policy not in (None, "mixed_bfloat16"):
+            raise ValueError(
+                f"Unsupported mixed_precision policy {policy!r}: " +
+                "use None or \"mixed_bfloat16\"")
+        self.dtype = get_dtype(hp)
         tf.keras.backend.set_floatx(self.dtype)
+        tf.keras.mixed_precision.set_global_policy(policy or self.dtype)
+
+        # Descriptive Keras model
         self.model = tf.keras.Sequential()
         self.model.add(tf.keras.layers.InputLayer(input_shape=(layers[0],)))
         self.model.add(tf.keras.layers.Lambda(
-            lambda X: 2.0*(X - lb)/(ub - lb) - 1.0))
+            lambda X: 2.0*(X - lb)/(ub - lb) - 1.0, dtype=self.dtype))
         for width in layers[1:-1]:
             self.model.add(tf.keras.layers.Dense(
                 width, activation=tf.nn.tanh,
                 kernel_initializer="glorot_normal"))
         self.model.add(tf.keras.layers.Dense(
                 layers[-1], activation=None,
-                kernel_initializer="glorot_normal"))
+                kernel_initializer="glorot_normal", dtype=self.dtype))
+
+        # Prediction-only forward pass, traced once for any number of points
+        self.predict_model = tf.function(
+            self.model, jit_compile=True,
+            input_signature=[tf.TensorSpec([None, layers[0]], self.dtype)])
 
         # Computing the sizes of weights/biases for future decomposition
         self.sizes_w = []
@@ -90,25 +117,54 @@ class NeuralNetwork(object):
 
     def get_loss_and_flat_grad(self, X, u):
         def loss_and_flat_grad(w):
-            with tf.GradientTape() as tape:
-                self.set_weights(w)
-                loss_value = self.loss(u, self.model(X))
-            grad = tape.gradient(loss_value, self.wrap_training_variables())
-            grad_flat = []
-            for g in grad:
-                grad_flat.append(tf.reshape(g, [-1]))
-            grad_flat = tf.concat(grad_flat, 0)
-            return loss_value, grad_flat
+            self.set_weights(w)
+            return self.flat_grad(X, u)
 
         return loss_and_flat_grad
 
+    # Compiling the L-BFGS evaluations too, so that the Dense/tanh chain
+    # and its derivatives run as fused kernels rather than eager ops
+    @tf.function(jit_compile=True)
+    def flat_grad(self, X, u):
+        loss_value, grad = self.grad(X, u)
+        grad_flat = []
+        for g in grad:
+            grad_flat.append(tf.reshape(g, [-1]))
+        grad_flat = tf.concat(grad_flat, 0)
+        return loss_value, grad_flat
+
     def tf_optimization(self, X_u, u):
         self.logger.log_train_opt("Adam")
-        for epoch in range(self.tf_epochs):
-            loss_value = self.tf_optimization_step(X_u, u)
+        # Only coming back to Python when there is something to log
+        frequency = self.logger.frequency
+        for epoch in range(0, self.tf_epochs, frequency):
+            steps = min(frequency, self.tf_epochs - epoch)
+            loss_value = self.tf_optimization_steps(
+                    X_u, u, tf.constant(steps))
             self.logger.log_train_epoch(epoch, loss_value)
 
-    # @tf.function
+    # Running a whole chunk of Adam steps as one compiled loop,
+    # and returning the loss of its first step for logging
+    @tf.function(jit_compile=True)
+    def tf_optimization_steps(self, X_u, u, steps):
+        loss_value = self.tf_optimization_step(*self.tf_batch(X_u, u))
+        for _ in tf.range(steps - 1):
+            self.tf_optimization_step(*self.tf_batch(X_u, u))
+        return loss_value
+
+    # Drawing a random mini-batch (without replacement) of the training
+    # points for each Adam step, or keeping the full batch by default
+    def tf_batch(self, X_u, u):
+        if self.tf_batch_size is None:
+            return X_u, u
+        idx = tf.argsort(self.tf_rng.uniform([tf.shape(X_u)[0]]))
+        idx = idx[:self.tf_batch_size]
+        return tf.gather(X_u, idx), tf.gather(u, idx)
+
+    # Tracing the whole Adam step (forward, tape and update) once,
+    # to avoid paying the eager op-dispatch cost on every epoch,
+    # and letting XLA fuse the small Dense/tanh kernels together
+    @tf.function(jit_compile=True)
     def tf_optimization_step(self, X_u, u):
         loss_value, grads = self.grad(X_u, u)
         self.tf_optimizer.apply_gradients(
@@ -149,7 +205,7 @@ class NeuralNetwork(object):
         self.logger.log_train_end(self.tf_epochs + self.nt_config.maxIter)
 
     def predict(self, X_star):
-        u_pred = self.model(X_star)
+        u_pred = self.predict_model(self.tensor(X_star))
         return u_pred.numpy()
 
     def summary(self):